@@ -359,6 +359,14 @@ class Config:
     "Set it to False to force instantiation for each item during sets iterations. Experimental. This penalize the iteration but avoids"
     "the use of .clone() ot the items.") == TRUE_STR
 
+    SCIPION_SQLITE_TUNE = _get('SCIPION_SQLITE_TUNE', FALSE_STR,
+    "Set it to True to tune the sqlite connection of the project settings (WAL journal, normal synchronous mode and "
+    "memory temp store). Experimental. Avoid it for projects in network file systems, WAL does not work there.") == TRUE_STR
+
+    SCIPION_SQLITE_BATCH_TUNE = _get('SCIPION_SQLITE_BATCH_TUNE', FALSE_STR,
+    "Set it to True to tune the sqlite connection of the sets during batch appends (normal synchronous mode, memory "
+    "temp store and bigger cache). Previous values are restored after the batch. Experimental.") == TRUE_STR
+
     try:
         VIEWERS = ast.literal_eval(_get('VIEWERS', "{}", "Json string to define which viewer are the default ones per output type."))
     except Exception as e:
@@ -499,6 +507,16 @@ class Config:
     def getUpdateSetAttemptsWait(cls):
         return cls.SCIPION_UPDATE_SET_ATTEMPT_WAIT
 
+    @classmethod
+    def sqliteTuneOn(cls):
+        """ Returns True if the sqlite pragmas tuning (SCIPION_SQLITE_TUNE) is active """
+        return cls.SCIPION_SQLITE_TUNE
+
+    @classmethod
+    def sqliteBatchTuneOn(cls):
+        """ Returns True if the sqlite pragmas tuning of batch appends (SCIPION_SQLITE_BATCH_TUNE) is active """
+        return cls.SCIPION_SQLITE_BATCH_TUNE
+
     @classmethod
     def colorsInTerminal(cls):
         """ Returns true if colors are allowed. Based on NO_COLOR variable. Undefined or '' colors are enabled"""
@@ -71,11 +71,14 @@ class BoolVar:
 
     def set(self, value):
         if value is None:
-            self.tkVar.set(-1)
+            v = -1
         elif value:
-            self.tkVar.set(1)
+            v = 1
         else:
-            self.tkVar.set(0)
+            v = 0
+        # Setting the tk var fires the traces even if the value is the same
+        if self.tkVar.get() != v:
+            self.tkVar.set(v)
 
     def get(self):
         if self.tkVar.get() == -1:
@@ -99,12 +102,20 @@ class PointerVar:
         if not isinstance(value, pwobj.Pointer):
             raise Exception('Pointer var should be used with pointers!!!\n'
                             ' Passing: %s, type: %s' % (value, type(value)))
+        # Nothing changes when clearing an empty pointer, avoid firing the traces
+        if (self._isEmpty(self._pointer) and self._isEmpty(value)
+                and self.tkVar.get() == ''):
+            return
         self._pointer.copy(value)
 
         label, _ = getPointerLabelAndInfo(self._pointer,
                                           self._protocol.getMapper())
         self.tkVar.set(label)
 
+    @staticmethod
+    def _isEmpty(pointer):
+        return not (pointer.hasValue() or pointer.hasExtended())
+
     def get(self):
         return self._pointer
 
@@ -321,23 +332,22 @@ class ComboVar:
         self.enum = enum
         self.value = None
         self.trace = self.tkVar.trace
+        # self.enum.choices is an object of type odict_values, which
+        # cannot be indexed, so a type cast to list is required
+        self._choices = list(enum.choices)
+        # Index of each choice, to avoid scanning the choices on every get
+        self._index = {c: i for i, c in enumerate(self._choices)}
 
     def set(self, value):
         self.value = value
         if isinstance(value, int):
-            # self.enum.choices is an object of type odict_values, which
-            # cannot be indexed, so a type cast to list is required
-            self.tkVar.set(list(self.enum.choices)[value])
-        else:
-            self.tkVar.set(value)  # also support string values
+            value = self._choices[value]
+        # also support string values
+        if self.tkVar.get() != value:
+            self.tkVar.set(value)
 
     def get(self):
-        v = self.tkVar.get()
-        self.value = None
-        for i, c in enumerate(list(self.enum.choices)):
-            if c == v:
-                self.value = i
-
+        self.value = self._index.get(self.tkVar.get())
         return self.value
 
 
@@ -868,6 +878,7 @@ class SectionWidget(SectionFrame):
         self.form = form
         self.section = section
         self.callback = callback
+        self._visible = None  # Last state set by _onVarChanged
         SectionFrame.__init__(self, master, self.section.label.get(),
                               height=height, **args)
 
@@ -897,10 +908,14 @@ class SectionWidget(SectionFrame):
         self.contentFrame.grid_remove()
 
     def _onVarChanged(self, *args):
-        if self.get():
-            self.show()
-        else:
-            self.hide()
+        # Only show or hide the content if its state changes
+        visible = bool(self.get())
+        if visible != self._visible:
+            self._visible = visible
+            if visible:
+                self.show()
+            else:
+                self.hide()
 
         if self.callback is not None:
             self.callback(self.paramName)
@@ -940,9 +955,12 @@ class ParamWidget:
         self.parent = parent
         self.visualizeCallback = visualizeCallback
         self.var = None
+        # The label is also needed every time the widget is shown
+        self._labelText = param.label.get()
 
         self._btnCol = 0
         self._labelFont = self.window.font
+        self._visible = None  # Last state set by display
 
         self._initialize(showButtons)
         self._createLabel()  # self.label should be set after this
@@ -974,7 +992,7 @@ class ParamWidget:
         self._onlyLabel = False
 
     def _getParamLabel(self):
-        return self.param.label.get()
+        return self._labelText
 
     def _createLabel(self):
         bgColor = pw.Config.SCIPION_BG_COLOR
@@ -1062,150 +1080,174 @@ class ParamWidget:
 
         return var, frame
 
-    def _createContentWidgets(self, param, content):
-        """Create the specific widgets inside the content frame"""
-        # Create widgets for each type of param
-        t = type(param)
-        entryWidth = 30
-        sticky = "we"
+    def _createHiddenBooleanContent(self, param, content):
+        return 0
 
-        # functions to select and remove
-        selectFunc = None
-        removeFunc = None
-
-        if t is pwprot.HiddenBooleanParam:
-            var = 0
-
-        elif t is pwprot.BooleanParam:
-            var, frame = ParamWidget.createBoolWidget(content, display=param.display,
-                                                      bg=pw.Config.SCIPION_BG_COLOR,
-                                                      font=self.window.font)
-            frame.grid(row=0, column=0, sticky='w')
-
-        elif t is pwprot.EnumParam:
-            var = ComboVar(param)
-            if param.display == pwprot.EnumParam.DISPLAY_COMBO:
-                combo = ttk.Combobox(content, textvariable=var.tkVar,
-                                     state='readonly', font=self.window.font)
-                combo['values'] = param.choices
-                combo.grid(row=0, column=0, sticky='we')
-            elif param.display == pwprot.EnumParam.DISPLAY_LIST:
-                for i, opt in enumerate(param.choices):
-                    rb = tk.Radiobutton(content, text=opt, variable=var.tkVar,
-                                        value=opt, font=self.window.font,
-                                        bg=pw.Config.SCIPION_BG_COLOR, highlightthickness=0)
-                    rb.grid(row=i, column=0, sticky='w')
-            elif param.display == pwprot.EnumParam.DISPLAY_HLIST:
-                rbFrame = tk.Frame(content, bg=pw.Config.SCIPION_BG_COLOR)
-                rbFrame.grid(row=0, column=0, sticky='w')
-                for i, opt in enumerate(param.choices):
-                    rb = tk.Radiobutton(rbFrame, text=opt, variable=var.tkVar,
-                                        value=opt, font=self.window.font,
-                                        bg=pw.Config.SCIPION_BG_COLOR)
-                    rb.grid(row=0, column=i, sticky='w', padx=(0, 5))
-            else:
-                raise Exception("Invalid display value '%s' for EnumParam"
-                                % str(param.display))
-
-        elif t is pwprot.MultiPointerParam:
-            tp = MultiPointerTreeProvider(self._protocol.mapper)
-            tree = BoundTree(content, tp, height=5)
-            var = MultiPointerVar(tp, tree)
-            var.trace('w', self.window._onPointerChanged)
-            tree.grid(row=0, column=0, sticky='we')
-            self._addButton("Select", pwutils.Icon.ACTION_SEARCH, self._browseObject)
-            self._addButton("Remove", pwutils.Icon.ACTION_DELETE, self._removeObject)
-            self._selectmode = 'extended'  # allows multiple object selection
-            self.visualizeCallback = self._visualizeMultiPointerParam
-
-        elif t is pwprot.PointerParam or t is pwprot.RelationParam:
-            var = PointerVar(self._protocol)
-            var.trace('w', self.window._onPointerChanged)
-            entry = tk.Label(content, textvariable=var.tkVar,
-                             font=self.window.font, anchor="w")
-            entry.grid(row=0, column=0, sticky='we')
-
-            if t is pwprot.RelationParam:
-                selectFunc = self._browseRelation
-                removeFunc = self._removeRelation
-            else:
-                selectFunc = self._browseObject
-                removeFunc = self._removeObject
+    def _createBooleanContent(self, param, content):
+        var, frame = ParamWidget.createBoolWidget(content, display=param.display,
+                                                  bg=pw.Config.SCIPION_BG_COLOR,
+                                                  font=self.window.font)
+        frame.grid(row=0, column=0, sticky='w')
+        return var
 
-                self.visualizeCallback = self._visualizePointerParam
-            self._selectmode = 'browse'  # single object selection
+    def _createEnumContent(self, param, content):
+        var = ComboVar(param)
+        if param.display == pwprot.EnumParam.DISPLAY_COMBO:
+            combo = ttk.Combobox(content, textvariable=var.tkVar,
+                                 state='readonly', font=self.window.font)
+            combo['values'] = param.choices
+            combo.grid(row=0, column=0, sticky='we')
+        elif param.display == pwprot.EnumParam.DISPLAY_LIST:
+            for i, opt in enumerate(param.choices):
+                rb = tk.Radiobutton(content, text=opt, variable=var.tkVar,
+                                    value=opt, font=self.window.font,
+                                    bg=pw.Config.SCIPION_BG_COLOR, highlightthickness=0)
+                rb.grid(row=i, column=0, sticky='w')
+        elif param.display == pwprot.EnumParam.DISPLAY_HLIST:
+            rbFrame = tk.Frame(content, bg=pw.Config.SCIPION_BG_COLOR)
+            rbFrame.grid(row=0, column=0, sticky='w')
+            for i, opt in enumerate(param.choices):
+                rb = tk.Radiobutton(rbFrame, text=opt, variable=var.tkVar,
+                                    value=opt, font=self.window.font,
+                                    bg=pw.Config.SCIPION_BG_COLOR)
+                rb.grid(row=0, column=i, sticky='w', padx=(0, 5))
+        else:
+            raise Exception("Invalid display value '%s' for EnumParam"
+                            % str(param.display))
+        return var
+
+    def _createMultiPointerContent(self, param, content):
+        tp = MultiPointerTreeProvider(self._protocol.mapper)
+        tree = BoundTree(content, tp, height=5)
+        var = MultiPointerVar(tp, tree)
+        var.trace('w', self.window._onPointerChanged)
+        tree.grid(row=0, column=0, sticky='we')
+        self._addButton("Select", pwutils.Icon.ACTION_SEARCH, self._browseObject)
+        self._addButton("Remove", pwutils.Icon.ACTION_DELETE, self._removeObject)
+        self._selectmode = 'extended'  # allows multiple object selection
+        self.visualizeCallback = self._visualizeMultiPointerParam
+        return var
+
+    def _createPointerContent(self, param, content):
+        var = PointerVar(self._protocol)
+        var.trace('w', self.window._onPointerChanged)
+        entry = tk.Label(content, textvariable=var.tkVar,
+                         font=self.window.font, anchor="w")
+        entry.grid(row=0, column=0, sticky='we')
+
+        if type(param) is pwprot.RelationParam:
+            selectFunc = self._browseRelation
+            removeFunc = self._removeRelation
+        else:
+            selectFunc = self._browseObject
+            removeFunc = self._removeObject
 
-        elif t is pwprot.ProtocolClassParam:
-            var = tk.StringVar()
-            entry = tk.Label(content, textvariable=var, font=self.window.font,
-                             anchor="w")
-            entry.grid(row=0, column=0, sticky='we')
+            self.visualizeCallback = self._visualizePointerParam
+        self._selectmode = 'browse'  # single object selection
+        self._addButton("Select", pwutils.Icon.ACTION_SEARCH, selectFunc)
+        self._addButton("Remove", pwutils.Icon.ACTION_DELETE, removeFunc)
+        return var
 
-            protClassName = self.param.protocolClassName.get()
+    def _createProtocolClassContent(self, param, content):
+        var = tk.StringVar()
+        entry = tk.Label(content, textvariable=var, font=self.window.font,
+                         anchor="w")
+        entry.grid(row=0, column=0, sticky='we')
 
-            if self.param.allowSubclasses:
-                classes = pw.Config.getDomain().findSubClasses(
-                    pw.Config.getDomain().getProtocols(), protClassName).keys()
-            else:
-                classes = [protClassName]
+        protClassName = self.param.protocolClassName.get()
 
-            if len(classes) > 1:
-                self._addButton("Select", pwutils.Icon.ACTION_SEARCH,
-                                self._browseProtocolClass)
-            else:
-                var.set(classes[0])
+        if self.param.allowSubclasses:
+            classes = pw.Config.getDomain().findSubClasses(
+                pw.Config.getDomain().getProtocols(), protClassName).keys()
+        else:
+            classes = [protClassName]
 
-            self._addButton("Edit", pwutils.Icon.ACTION_EDIT, self._openProtocolForm)
+        if len(classes) > 1:
+            self._addButton("Select", pwutils.Icon.ACTION_SEARCH,
+                            self._browseProtocolClass)
+        else:
+            var.set(classes[0])
 
-        elif t is pwprot.Line:
-            var = None
+        self._addButton("Edit", pwutils.Icon.ACTION_EDIT, self._openProtocolForm)
+        return var
 
-        elif t is pwprot.LabelParam:
-            var = None
-            self._onlyLabel = True
+    def _createLineContent(self, param, content):
+        return None
 
-        elif t is pwprot.TextParam:
-            w = max(entryWidth, param.width)
-            text = Text(content, font=self.window.font, width=w,
-                        height=param.height)
-            var = TextVar(text)
-            text.grid(row=0, column=0, sticky='w')
+    def _createLabelContent(self, param, content):
+        self._onlyLabel = True
+        return None
 
-        else:
+    def _createTextContent(self, param, content):
+        w = max(30, param.width)
+        text = Text(content, font=self.window.font, width=w,
+                    height=param.height)
+        var = TextVar(text)
+        text.grid(row=0, column=0, sticky='w')
+        return var
 
-            if not param.allowsPointers:
-                var = tk.StringVar()
+    def _createEntryContent(self, param, content):
+        """ Default content for the params without a specific builder
+        in _contentBuilders: an entry, with a pointer when allowed. """
+        t = type(param)
+        entryWidth = 30
+        sticky = "we"
+        selectFunc = None
 
-                if issubclass(t, pwprot.FloatParam) or issubclass(t, pwprot.IntParam):
-                    # Reduce the entry width for numbers entries
-                    entryWidth = self._entryWidth
-                    sticky = 'w'
-            else:
-                selectFunc = self._browseScalar
-                var = ScalarWithPointerVar(self._protocol,
-                                           self.window._onPointerChanged)
-                self._selectmode = 'browse'
-                sticky = 'ew'
-            state = tk.DISABLED if param.readOnly else tk.NORMAL
-            entry = tk.Entry(content, width=entryWidth, textvariable=var,
-                             font=self.window.font, state=state)
-
-            # Select all content on focus
-            entry.bind("<FocusIn>",
-                       lambda event: entry.selection_range(0, tk.END))
-
-            entry.grid(row=0, column=0, sticky=sticky)
-
-            if issubclass(t, pwprot.PathParam):
-                self._entryPath = entry
-                self._addButton('Browse', pwutils.Icon.ACTION_BROWSE,
-                                self._browsePath)
+        if not param.allowsPointers:
+            var = tk.StringVar()
+
+            if issubclass(t, pwprot.FloatParam) or issubclass(t, pwprot.IntParam):
+                # Reduce the entry width for numbers entries
+                entryWidth = self._entryWidth
+                sticky = 'w'
+        else:
+            selectFunc = self._browseScalar
+            var = ScalarWithPointerVar(self._protocol,
+                                       self.window._onPointerChanged)
+            self._selectmode = 'browse'
+            sticky = 'ew'
+        state = tk.DISABLED if param.readOnly else tk.NORMAL
+        entry = tk.Entry(content, width=entryWidth, textvariable=var,
+                         font=self.window.font, state=state)
+
+        # Select all content on focus
+        entry.bind("<FocusIn>",
+                   lambda event: entry.selection_range(0, tk.END))
+
+        entry.grid(row=0, column=0, sticky=sticky)
+
+        if issubclass(t, pwprot.PathParam):
+            self._entryPath = entry
+            self._addButton('Browse', pwutils.Icon.ACTION_BROWSE,
+                            self._browsePath)
 
         if selectFunc is not None:
             self._addButton("Select", pwutils.Icon.ACTION_SEARCH, selectFunc)
+        return var
+
+    # Name of the content builder method for each param class (exact type,
+    # no subclasses), params not listed here get an entry
+    # (see _createEntryContent)
+    _contentBuilders = {
+        pwprot.HiddenBooleanParam: '_createHiddenBooleanContent',
+        pwprot.BooleanParam: '_createBooleanContent',
+        pwprot.EnumParam: '_createEnumContent',
+        pwprot.MultiPointerParam: '_createMultiPointerContent',
+        pwprot.PointerParam: '_createPointerContent',
+        pwprot.RelationParam: '_createPointerContent',
+        pwprot.ProtocolClassParam: '_createProtocolClassContent',
+        pwprot.Line: '_createLineContent',
+        pwprot.LabelParam: '_createLabelContent',
+        pwprot.TextParam: '_createTextContent',
+    }
 
-        if removeFunc is not None:
-            self._addButton("Remove", pwutils.Icon.ACTION_DELETE, removeFunc)
+    def _createContentWidgets(self, param, content):
+        """Create the specific widgets inside the content frame"""
+        # Create widgets for each type of param
+        builderName = self._contentBuilders.get(type(param),
+                                                '_createEntryContent')
+        var = getattr(self, builderName)(param, content)
 
         if self.visualizeCallback is not None:
             self._addButton(pwutils.Message.LABEL_BUTTON_VIS,
@@ -1455,7 +1497,12 @@ class ParamWidget:
             self.btnFrame.grid_remove()
 
     def display(self, condition):
-        """ show or hide depending on the condition. """
+        """ show or hide depending on the condition.
+        Nothing is done if the widget is already in that state. """
+        condition = bool(condition)
+        if condition == self._visible:
+            return
+        self._visible = condition
         if condition:
             self.show()
         else:
@@ -1553,6 +1600,8 @@ class FormWindow(Window):
         # Some initialization
         self.callback = callback
         self.widgetDict = {}  # Store tkVars associated with params
+        # (paramName, widget) of the definition params, to update them on save
+        self._paramBindings = []
         self.visualizeDict = kwargs.get('visualizeDict', {})
         self.disableRunMode = kwargs.get('disableRunMode', False)
         self.bindings = []
@@ -1568,6 +1617,8 @@ class FormWindow(Window):
         self.updateProtocolCallback = kwargs.get('updateProtocolCallback', None)
         domain = pw.Config.getDomain()
         self.wizards = domain.findWizards(protocol, DESKTOP_TKINTER)
+        # True while a check of all params is scheduled (see _onExpertLevelChanged)
+        self._checkPending = False
 
         # Call legacy for compatibility on protocol
         protocol.legacyCheck()
@@ -2049,6 +2100,8 @@ class FormWindow(Window):
         binding = Binding(paramName, var, self.protocol,
                           func, *callbacks)
         self.widgetDict[paramName] = var
+        if self.protocol.getParam(paramName) is not None:
+            self._paramBindings.append((paramName, var))
         self.bindings.append(binding)
 
     def _createBoundEntry(self, parent, paramName, width=5,
@@ -2270,6 +2323,7 @@ class FormWindow(Window):
                                          visualizeCallback=visualizeCallback)
 
                     widget.show()  # Show always, conditions will be checked later
+                self._paramBindings.append((paramName, widget))
             r += 1
             self.widgetDict[paramName] = widget
         # Ensure width and height needed
@@ -2300,6 +2354,7 @@ class FormWindow(Window):
                                      callback=self._checkChanges,
                                      visualizeCallback=visualizeCallback)
                 widget.show()  # Show always, conditions will be checked later
+                self._paramBindings.append((paramName, widget))
             r += 1
             self.widgetDict[paramName] = widget
 
@@ -2324,6 +2379,7 @@ class FormWindow(Window):
             widget.show()  # Show always, conditions will be checked later
             c += 2
             self.widgetDict[paramName] = widget
+            self._paramBindings.append((paramName, widget))
 
     def _checkCondition(self, paramName, toggleWidgetVisibility=True):
         """Check if the condition of a param is satisfied
@@ -2351,18 +2407,28 @@ class FormWindow(Window):
         """Check the conditions of all params affected
         by this param"""
         self.setParamFromVar(paramName)
-        param = self.protocol.getParam(paramName)
+        dependants = self.protocol.getParam(paramName)._dependants
 
-        for d in param._dependants:
-            self._checkCondition(d)
+        # Most params (e.g. while typing in an entry) do not affect
+        # any other one, so there is no need to adjust the sections
+        if dependants:
+            for d in dependants:
+                self._checkCondition(d)
 
-        self.adjustSections()
+            self.adjustSections()
 
     def _checkAllChanges(self, toggleWidgetVisibility=True):
         for paramName in self.widgetDict:
             self._checkCondition(paramName, toggleWidgetVisibility=toggleWidgetVisibility)
 
     def _onExpertLevelChanged(self, *args):
+        # Several changes in a row trigger a single check, when Tk is idle
+        if not self._checkPending:
+            self._checkPending = True
+            self.root.after_idle(self._doCheckAllChanges)
+
+    def _doCheckAllChanges(self):
+        self._checkPending = False
         self._checkAllChanges()
         self.root.update_idletasks()
         self.adjustSections()
@@ -2416,33 +2482,36 @@ class FormWindow(Window):
     def setParamFromVar(self, paramName):
         param = getattr(self.protocol, paramName, None)
         if param is not None:
-            widget = self.widgetDict[paramName]
-            try:
-                value = widget.get()
-
-                # Special treatment for pointer params
-                if isinstance(param, pwobj.Pointer):
-                    param.copy(value)
-                # Special treatment for Scalars that allow pointers
-                # Combo widgets do not have .param!
-                elif hasattr(widget, "param") and widget.param.allowsPointers:
-                    if isinstance(value, pwobj.Pointer):
-                        # Copy the pointer, otherwise changes in the
-                        # widget pointer will be reflected
-                        pointerCopy = pwobj.Pointer()
-                        pointerCopy.copy(value)
-                        param.setPointer(pointerCopy)
-                    else:
-                        param.setPointer(None)
-                        param.set(value)
+            self._setParamValue(paramName, param, self.widgetDict[paramName])
+
+    def _setParamValue(self, paramName, param, widget):
+        """ Set the protocol attribute param from the value of its widget. """
+        try:
+            value = widget.get()
 
-                elif isinstance(param, pwobj.Object):
+            # Special treatment for pointer params
+            if isinstance(param, pwobj.Pointer):
+                param.copy(value)
+            # Special treatment for Scalars that allow pointers
+            # Combo widgets do not have .param!
+            elif hasattr(widget, "param") and widget.param.allowsPointers:
+                if isinstance(value, pwobj.Pointer):
+                    # Copy the pointer, otherwise changes in the
+                    # widget pointer will be reflected
+                    pointerCopy = pwobj.Pointer()
+                    pointerCopy.copy(value)
+                    param.setPointer(pointerCopy)
+                else:
+                    param.setPointer(None)
                     param.set(value)
-            except ValueError:
-                if len(value):
-                    print(">>> ERROR: setting param for: ", paramName,
-                          "value: '%s'" % value)
-                param.set(None)
+
+            elif isinstance(param, pwobj.Object):
+                param.set(value)
+        except ValueError:
+            if len(value):
+                print(">>> ERROR: setting param for: ", paramName,
+                      "value: '%s'" % value)
+            param.set(None)
 
     def updateLabelAndCommentVars(self):
         """ Read the label and comment first line to update
@@ -2464,8 +2533,11 @@ class FormWindow(Window):
         """ This method is only used from WEB, since in Tk all params
         are updated when they are changed.
         """
-        for paramName, _ in self.protocol.iterDefinitionAttributes():
-            self.setParamFromVar(paramName)
+        for paramName, widget in self._paramBindings:
+            # The attribute could have been replaced after building the form
+            param = getattr(self.protocol, paramName, None)
+            if param is not None:
+                self._setParamValue(paramName, param, widget)
 
     def _onPointerChanged(self, *args):
         btnExecute = getattr(self, 'btnExecute', None)
@@ -46,6 +46,7 @@ FONT_ITALIC = 'fontItalic'
 FONT_NORMAL = 'fontNormal'
 FONT_BOLD = 'fontBold'
 FONT_BIG = 'fontBig'
+FONT_BIG_BOLD = 'fontBigBold'
 # TextColor
 # cfgCitationTextColor = "dark olive green"
 # cfgLabelTextColor = "black"
@@ -151,8 +152,9 @@ def setCommonFonts(windows=None):
     setFont(FONT_BIG, family=pw.Config.SCIPION_FONT_NAME, size=pw.Config.SCIPION_FONT_SIZE+8)
 
     if windows:
-        windows.fontBig = tkFont.Font(size=pw.Config.SCIPION_FONT_SIZE + 2, family=pw.Config.SCIPION_FONT_NAME,
-                                      weight='bold')
+        # Shared by all windows, instead of creating a new font for each one
+        windows.fontBig = setFont(FONT_BIG_BOLD, size=pw.Config.SCIPION_FONT_SIZE + 2,
+                                  family=pw.Config.SCIPION_FONT_NAME, weight='bold')
         windows.font = f
         windows.fontBold = fb
         windows.fontItalic = fi
@@ -23,9 +23,12 @@
 # *
 # **************************************************************************
 """ This modules hosts most of the accessory code that is used in view protocols"""
-import json
 import os
-from configparser import ConfigParser
+
+try:
+    from orjson import loads as jsonLoads
+except ImportError:
+    from json import loads as jsonLoads
 
 from pyworkflow import Config
 import  pyworkflow.gui as pwgui
@@ -294,21 +297,28 @@ class ProtocolTreeConfig:
 
     @classmethod
     def __addToTree(cls, menu, item, checkFunction=None):
-        """ Helper function to recursively add items to a menu.
+        """ Helper function to add items to a menu.
         Add item (a dictionary that can contain more dictionaries) to menu
         If check function is added will use it to check if the value must be added.
+        The tree is walked with an explicit stack instead of recursion.
         """
-        children = item.pop('children', [])
+        rootMenu = None
+        stack = [(menu, item)]
 
-        if checkFunction is not None:
-            add = checkFunction(item)
-            if not add:
-                return
-        subMenu = menu.addSubMenu(**item)  # we expect item={'text': ...}
-        for child in children:
-            cls.__addToTree(subMenu, child, checkFunction)  # add recursively to sub-menu
+        while stack:
+            parent, node = stack.pop()
+            children = node.pop('children', [])
+
+            if checkFunction is not None and not checkFunction(node):
+                continue
+
+            subMenu = parent.addSubMenu(**node)  # we expect node={'text': ...}
+            if rootMenu is None:
+                rootMenu = subMenu
+            # Push in reverse order to keep the children order when popping
+            stack.extend((subMenu, child) for child in reversed(children))
 
-        return subMenu
+        return rootMenu
 
     @classmethod
     def __inSubMenu(cls, child, subMenu):
@@ -455,26 +465,23 @@ class ProtocolTreeConfig:
 
         def addProtocols():
             """ Adds protocols defined in the "PROTOCOLS" section of the config file. """
-            for menuName in cp.options('PROTOCOLS'):
+            for menuName, menuValue in sections['PROTOCOLS'].items():
                 if menuName not in protocols:  # The view has not been inserted
                     menu = ProtocolConfig(menuName)
-                    children = json.loads(cp.get('PROTOCOLS', menuName))
+                    children = jsonLoads(menuValue)
                     for child in children:
                         cls.__addToTree(menu, child, cls.__checkItem)
                     protocols[menuName] = menu
                 else:  # The view has been inserted
                     menu = protocols.get(menuName)
-                    children = json.loads(cp.get('PROTOCOLS',
-                                                 menuName))
+                    children = jsonLoads(menuValue)
                     cls.__findTreeLocation(menu.childs, children, menu)
 
         # Populate the protocols menu from the plugin config file.
         if os.path.exists(protocolsConfPath):
-            cp = ConfigParser()
-            cp.optionxform = str  # keep case
-            cp.read(protocolsConfPath)
+            sections = pwutils.readIniFile(protocolsConfPath)
             #  Ensure that the protocols section exists
-            if cp.has_section('PROTOCOLS'):
+            if 'PROTOCOLS' in sections:
                 addProtocols()
 
     @classmethod
@@ -482,29 +489,25 @@ class ProtocolTreeConfig:
         """ Read the protocol configuration from a .conf file similar to the
         one in scipion/config/protocols.conf,
         which is the default one when no file is passed.
+        The protocols.conf files are only parsed again when they change
+        (see readIniFile), but the tree is built on every call, since it
+        depends on the installed and enabled protocols and the views
+        change it (e.g. openItem).
         """
+        confPaths = [protocolsConf] + cls.__getPluginsConfPaths(domain)
         protocols = dict()
         # Read the protocols.conf from Scipion (base) and create an initial
         # tree view
         cls.__addProtocolsFromConf(protocols, protocolsConf)
 
         # Read the protocols.conf of any installed plugin
-        pluginDict = domain.getPlugins()
-
-        for pluginName in pluginDict.keys():
+        for protocolsConfPath in confPaths[1:]:
             try:
-
-                # if the plugin has a path
-                if pwutils.isModuleLoaded(pluginName) and pwutils.isModuleAFolder(pluginName):
-                    # Locate the plugin protocols.conf file
-                    protocolsConfPath = os.path.join(
-                        pluginDict[pluginName].__path__[0],
-                        cls.PLUGIN_CONFIG_PROTOCOLS)
-                    cls.__addProtocolsFromConf(protocols, protocolsConfPath)
+                cls.__addProtocolsFromConf(protocols, protocolsConfPath)
 
             except Exception as e:
                 print('Failed to read settings. The reported error was:\n  %s\n'
-                      'To solve it, fix %s and run again.' % e)
+                      'To solve it, fix %s and run again.' % (e, protocolsConfPath))
 
         # Clean empty sections
         cls._hideEmptySections(protocols)
@@ -514,6 +517,28 @@ class ProtocolTreeConfig:
 
         return protocols
 
+    @classmethod
+    def __getPluginsConfPaths(cls, domain):
+        """ Return the protocols.conf paths of the installed plugins. """
+        confPaths = []
+        pluginDict = domain.getPlugins()
+
+        for pluginName in pluginDict.keys():
+            try:
+
+                # if the plugin has a path
+                if pwutils.isModuleLoaded(pluginName) and pwutils.isModuleAFolder(pluginName):
+                    # Locate the plugin protocols.conf file
+                    confPaths.append(os.path.join(
+                        pluginDict[pluginName].__path__[0],
+                        cls.PLUGIN_CONFIG_PROTOCOLS))
+
+            except Exception as e:
+                print('Failed to locate %s protocols.conf. The reported '
+                      'error was:\n  %s\n' % (pluginName, e))
+
+        return confPaths
+
     @classmethod
     def _hideEmptySections(cls, protocols):
         """ Cleans all empty sections in the tree"""
@@ -541,6 +566,9 @@ class ProtocolTreeConfig:
 
 class ProtocolConfig(MenuConfig):
     """Store protocols configuration """
+    __slots__ = ()
+    # Default icons for some tags when no icon is given
+    _TAG_ICONS = {'protocol_base': Icon.GROUP}
 
     def __init__(self, text=None, value=None, **args):
         MenuConfig.__init__(self, text, value, **args)
@@ -549,9 +577,9 @@ class ProtocolConfig(MenuConfig):
 
     def addSubMenu(self, text, value=None, shortCut=None, **args):
         if 'icon' not in args:
-            tag = args.get('tag', None)
-            if tag == 'protocol_base':
-                args['icon'] = Icon.GROUP
+            icon = self._TAG_ICONS.get(args.get('tag', None))
+            if icon is not None:
+                args['icon'] = icon
 
         args['shortCut'] = shortCut
         return MenuConfig.addSubMenu(self, text, value, **args)
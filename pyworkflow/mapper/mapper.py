@@ -25,6 +25,7 @@
 # **************************************************************************
 import logging
 logger = logging.getLogger(__name__)
+from contextlib import nullcontext
 
 import pyworkflow.object as obj
 
@@ -105,6 +106,21 @@ class Mapper:
     def commit(self):
         """Commit changes made to the storage"""
         pass
+
+    def transaction(self):
+        """ Context manager to group several changes to the storage
+        in a single transaction. """
+        return nullcontext()
+
+    def batchInsert(self, batchSize=1000):
+        """ Context manager to insert many objects in batches. """
+        return nullcontext()
+
+    def setProperties(self, properties):
+        """ Set several properties (key, value pairs). By default, each
+        one is set with setProperty. """
+        for key, value in properties.items():
+            self.setProperty(key, value)
     
     def insert(self, obj):
         """Insert a new object into the system, the id will be set"""
@@ -26,6 +26,7 @@ import logging
 logger = logging.getLogger(__name__)
 import re
 from collections import OrderedDict
+from contextlib import contextmanager
 
 from pyworkflow import Config
 from pyworkflow.utils import replaceExt, joinExt, valueToList
@@ -38,6 +39,13 @@ PARENT_ID = 'parent_id'
 CLASSNAME = 'classname'
 NAME = 'name'
 
+# Pragmas for the set connection during batch inserts when
+# SCIPION_SQLITE_BATCH_TUNE is active. WAL is not used since it is
+# persistent, and other processes may read the sets sqlite.
+BULK_INSERT_PRAGMAS = {'synchronous': 'NORMAL',
+                       'temp_store': 'MEMORY',
+                       'cache_size': -200000}  # in KiB
+
 
 class SqliteMapper(Mapper):
     """Specific Mapper implementation using Sqlite database"""
@@ -56,6 +64,9 @@ class SqliteMapper(Mapper):
         
     def commit(self):
         self.db.commit()
+
+    def transaction(self):
+        return self.db.transaction()
         
     def __getObjectValue(self, obj):
         """ Get the value of the object to be stored.
@@ -791,6 +802,11 @@ class SqliteFlatMapper(Mapper):
         Mapper.__init__(self, dictClasses)
         self._objTemplate = None
         self._attributesToStore = None
+        # Rows waiting to be inserted when inside batchInsert
+        self._insertBuffer = None
+        self._insertBatchSize = None
+        # Indexes of a new set to be created at the end of batchInsert
+        self._pendingIndexes = None
         try:
             # We (ROB and JMRT) are playing with different
             # PRAGMAS (see https://www.sqlite.org/pragma.html)
@@ -833,17 +849,81 @@ class SqliteFlatMapper(Mapper):
     
     def commit(self):
         self.db.commit()
+
+    def transaction(self):
+        return self.db.transaction()
+
+    @contextmanager
+    def batchInsert(self, batchSize=1000):
+        """ Context manager to insert many objects faster. Inside it, the
+        rows of the inserted objects are buffered and written with a single
+        executemany every batchSize rows, all in a single transaction.
+        On a new set, the tables are created (and committed) by the first
+        insert, before the rows of the transaction, and its indexes are
+        created once at the end instead of being updated on every insert.
+        Note that buffered rows are not visible to queries until flushed.
+        With SCIPION_SQLITE_BATCH_TUNE, the BULK_INSERT_PRAGMAS are set
+        during the batch, unless a transaction is already open (some
+        pragmas can not be changed inside one).
+        """
+        self._insertBuffer = []
+        self._insertBatchSize = batchSize
+        self._pendingIndexes = None
+        previousPragmas = None
+        if Config.sqliteBatchTuneOn() and not self.db.connection.in_transaction:
+            previousPragmas = self.db.setPragmas(BULK_INSERT_PRAGMAS)
+        try:
+            with self.db.transaction():
+                yield self
+                self.flushInserts()
+                self._createPendingIndexes()
+        finally:
+            if self._pendingIndexes:
+                # The batch failed, but the tables of the new set are
+                # already created and need their indexes
+                self._createPendingIndexes()
+                self.db.commit()
+            self._insertBuffer = None
+            if previousPragmas:
+                self.db.setPragmas(previousPragmas)
+
+    def flushInserts(self):
+        """ Write the buffered rows, if any. """
+        if self._insertBuffer:
+            self.db.insertObjects(self._insertBuffer)
+            self._insertBuffer = []
+
+    def _createPendingIndexes(self):
+        if self._pendingIndexes:
+            self.db.createIndexes(self._pendingIndexes)
+        self._pendingIndexes = None
         
     def close(self):
         self.db.close()
         
     def insert(self, obj):
         if self.doCreateTables:
-            self.db.createTables(obj.getObjDict(includeClass=True))
+            inBatch = self._insertBuffer is not None
+            # Inside a batch, the indexes are created after all the inserts
+            indexesSql = self.db.createTables(obj.getObjDict(includeClass=True),
+                                              createIndexes=not inBatch)
             self.doCreateTables = False
+            if inBatch:
+                self._pendingIndexes = indexesSql
+                # createTables commits, open again the transaction of the
+                # batch so all the rows are still written in a single one
+                if not self.db.connection.in_transaction:
+                    self.db.executeCommand("BEGIN")
         """Insert a new object into the system, the id will be set"""
-        self.db.insertObject(obj.getObjId(), obj.isEnabled(), obj.getObjLabel(), obj.getObjComment(), 
-                             *self._getValuesFromObject(obj).values())
+        args = (obj.getObjId(), obj.isEnabled(), obj.getObjLabel(), obj.getObjComment(),
+                *self._getValuesFromObject(obj).values())
+
+        if self._insertBuffer is None:
+            self.db.insertObject(*args)
+        else:
+            self._insertBuffer.append(args)
+            if len(self._insertBuffer) >= self._insertBatchSize:
+                self.flushInserts()
 
     def getAttributes2Store(self, item):
 
@@ -866,10 +946,12 @@ class SqliteFlatMapper(Mapper):
         This is by default not allow, since most sets are not 
         modified after creation.
         """
-        if not self.doCreateTables:
-            obj = self.selectFirst()
-            if obj is not None:
-                self.db.setupCommands(obj.getObjDict(includeClass=True))
+        if not self.doCreateTables and self.db.INSERT_OBJECT is None:
+            # Setup the commands from the stored columns instead of
+            # building the first item, this is called on every
+            # streaming update of the output sets
+            self.db.setupCommands([r['label_property']
+                                   for r in self.db.getClassRows()])
         
     def clear(self):
         self.db.clear()
@@ -1078,6 +1160,29 @@ and restarting scipion. Export command:
         
         return self.__objectsFromRows(objRows, iterate, objectFilter) 
 
+    def selectAllByChunks(self, chunkSize=8192, objectFilter=None):
+        """ Iterate over all objects (sorted by id) doing a query for
+        every chunkSize rows. The rows of each chunk are fetched at once,
+        so the cursor is not kept busy while the objects are being used.
+        Chunks start after the last id read (instead of using OFFSET),
+        so every query is an index lookup.
+        """
+        if not self.db.hasTable('Properties'):
+            return
+
+        # Initialize the instance
+        self.getInstance()
+        where = None
+
+        while True:
+            objRows = self.db.selectAll(iterate=False, where=where,
+                                        limit=chunkSize)
+            if not objRows:
+                return
+            for obj in self.__iterObjectsFromRows(objRows, objectFilter):
+                yield obj
+            where = '%s>%d' % (ID, objRows[-1][ID])
+
     def unique(self, labels, where=None):
         """ Returns a list (for a single label) or a dictionary with unique values for the passed labels.
         If more than one label is passed it will be unique rows similar ti SQL unique clause.
@@ -1117,12 +1222,58 @@ and restarting scipion. Export command:
 
         return results
 
+    def getAttributeNames(self):
+        """ Return the names of the stored items attributes (in columns
+        order) from the Classes table, without building any object.
+        """
+        return [label for label, _ in self.getSchema() if label != SELF]
+
+    def getSchema(self):
+        """ Return a tuple with the (label_property, class_name) pairs
+        of the Classes table, including the items class (self row).
+        """
+        if self.doCreateTables:
+            return ()
+        return tuple((r['label_property'], r['class_name'])
+                     for r in self.db.getClassRows())
+
     def count(self):
         return 0 if self.doCreateTables else self.db.count()
 
     def maxId(self):
         return 0 if self.doCreateTables else self.db.maxId()
 
+    def randomIds(self, n):
+        return [] if self.doCreateTables else self.db.selectRandomIds(n)
+
+    def renumberIds(self, firstId=1):
+        if not self.doCreateTables:
+            self.flushInserts()
+            self.db.renumberIds(firstId)
+
+    def hasCommonIds(self, otherDbName, otherTablePrefix=''):
+        """ Return True if any id is present both in this table and in the
+        one stored in otherDbName (with otherTablePrefix).
+        """
+        return False if self.doCreateTables else self.db.hasCommonIds(otherDbName, otherTablePrefix)
+
+    def copyObjects(self, otherDbName, otherTablePrefix='', schema=None):
+        """ Copy the rows stored in otherDbName (with otherTablePrefix),
+        that must have the same schema. If the tables are not created
+        yet, they are created from the schema (as returned by getSchema).
+        It can not be used inside transaction() or batchInsert: creating
+        the tables and attaching the other db would commit it.
+        """
+        if self.db.isInTransaction():
+            raise Exception("Can not copy the objects of %s inside a transaction, "
+                            "it would commit it." % otherDbName)
+        if self.doCreateTables:
+            self.db.createTables(OrderedDict((label, (className,))
+                                             for label, className in schema))
+            self.doCreateTables = False
+        self.flushInserts()
+        return self.db.copyObjects(otherDbName, otherTablePrefix)
+
     def __objectsFromIds(self, objIds):
         """Return a list of objects, given a list of id's
         """
@@ -1136,6 +1287,9 @@ and restarting scipion. Export command:
         
     def setProperty(self, key, value):
         return self.db.setProperty(key, value)
+
+    def setProperties(self, properties):
+        return self.db.setProperties(properties)
     
     def deleteProperty(self, key):
         return self.db.deleteProperty(key)
@@ -1197,7 +1351,7 @@ class SqliteFlatDb(SqliteDb):
         self.INSERT_CLASS = ("INSERT INTO %sClasses (label_property, "
                              "column_name, class_name) VALUES (?, ?, ?)"
                              % tablePrefix)
-        self.SELECT_CLASS = "SELECT * FROM %sClasses;" % tablePrefix
+        self.SELECT_CLASS = "SELECT * FROM %sClasses ORDER BY id;" % tablePrefix
         self.EXISTS = "SELECT EXISTS(SELECT 1 FROM Objects WHERE %s=? LIMIT 1)"
         self.tablePrefix = tablePrefix
         self._createConnection(dbName, timeout)
@@ -1206,6 +1360,7 @@ class SqliteFlatDb(SqliteDb):
         self._columnsMapping = {}
 
         self.INSERT_PROPERTY = "INSERT INTO Properties (key, value) VALUES (?, ?)"
+        self.REPLACE_PROPERTY = "INSERT OR REPLACE INTO Properties (key, value) VALUES (?, ?)"
         self.DELETE_PROPERTY = "DELETE FROM Properties WHERE key=?"
         self.UPDATE_PROPERTY = "UPDATE Properties SET value=? WHERE key=?"
         self.SELECT_PROPERTY = "SELECT value FROM Properties WHERE key=?"
@@ -1251,6 +1406,19 @@ class SqliteFlatDb(SqliteDb):
             self.executeCommand(self.UPDATE_PROPERTY, (value, key))
         else:
             self.executeCommand(self.INSERT_PROPERTY, (key, value))
+
+    def setProperties(self, properties):
+        """ Insert or update all the properties (key, value pairs) in
+        the properties dict with a single executemany.
+        """
+        # Just ignore the set properties for empty sets
+        if not self.hasTable('Properties'):
+            return
+
+        # All properties are stored as string, except for None type
+        self.cursor.executemany(self.REPLACE_PROPERTY,
+                                [(key, str(value) if value is not None else None)
+                                 for key, value in properties.items()])
             
     def getPropertyKeys(self):
         """ Return all properties stored of this object. """
@@ -1281,10 +1449,12 @@ class SqliteFlatDb(SqliteDb):
         self.executeCommand("DROP TABLE IF EXISTS %sObjects;"
                             % self.tablePrefix)
 
-    def createTables(self, objDict):
+    def createTables(self, objDict, createIndexes=True):
         """Create the Classes and Object table to store items of a Set.
         Each object will be stored in a single row.
         Each nested property of the object will be stored as a column value.
+        Return the sql commands of the indexes of the Objects table, that
+        are only created here if createIndexes is True.
         """
         self.setVersion(self.VERSION)
         for pragma in self._pragmas.items():
@@ -1325,15 +1495,33 @@ class SqliteFlatDb(SqliteDb):
         # Create the Objects table
         self.executeCommand(CREATE_OBJECT_TABLE)
 
-        for idx in self._indexes:
-            # first check if the attribute to be indexed exists
-            if idx in colMap:
-                self.executeCommand("CREATE INDEX index_%s ON Objects (%s);"
-                                    % (idx.replace('.', '_'), colMap[idx]))
+        # first check if the attribute to be indexed exists
+        indexesSql = ["CREATE INDEX index_%s ON Objects (%s);"
+                      % (idx.replace('.', '_'), colMap[idx])
+                      for idx in self._indexes if idx in colMap]
+        if createIndexes:
+            self.createIndexes(indexesSql)
 
         self.commit()
         # Prepare the INSERT and UPDATE commands
         self.setupCommands(objDict)
+        return indexesSql
+
+    def setPragmas(self, pragmas):
+        """ Set the pragmas of the connection (outside of a transaction)
+        and return their previous values, to be able to restore them.
+        """
+        previous = {}
+        for key, value in pragmas.items():
+            self.executeCommand("PRAGMA %s;" % key)
+            previous[key] = self.cursor.fetchone()[0]
+            self.executeCommand("PRAGMA %s = %s;" % (key, value))
+        return previous
+
+    def createIndexes(self, indexesSql):
+        """ Create the indexes returned by createTables. """
+        for sql in indexesSql:
+            self.executeCommand(sql)
 
     def setupCommands(self, objDict):
         """ Setup the INSERT and UPDATE commands base on the object dictionary. """
@@ -1383,6 +1571,11 @@ class SqliteFlatDb(SqliteDb):
         where created."""
         self.executeCommand(self.INSERT_OBJECT, args)
 
+    def insertObjects(self, rows):
+        """ Insert several objects rows at once.
+        rows: list of the args that insertObject would receive."""
+        self.cursor.executemany(self.INSERT_OBJECT, rows)
+
     def updateObject(self, *args):
         """Update object data """
         self.executeCommand(self.UPDATE_OBJECT, args)
@@ -1549,6 +1742,85 @@ class SqliteFlatDb(SqliteDb):
         self.executeCommand(self.selectCmd('1').replace('*', 'MAX(id)'))
         return self.cursor.fetchone()[0]
 
+    def renumberIds(self, firstId=1):
+        """ Renumber the ids of the Objects table, keeping their order,
+        to be consecutive starting at firstId. It is done with a few
+        sql commands, using a temporary table with the new ids.
+        """
+        with self.transaction():
+            self.executeCommand("DROP TABLE IF EXISTS temp.renumber;")
+            self.executeCommand("CREATE TEMP TABLE renumber "
+                                "(newId INTEGER PRIMARY KEY, oldId INTEGER UNIQUE);")
+            self.executeCommand("INSERT INTO temp.renumber (oldId) SELECT id %s ORDER BY id;"
+                                % self.FROM)
+            # Negate the ids first to avoid collisions while updating
+            self.executeCommand("UPDATE %sObjects SET id = -id;" % self.tablePrefix)
+            self.executeCommand("UPDATE {0}Objects SET id = ? + (SELECT newId FROM temp.renumber "
+                                "WHERE oldId = -{0}Objects.id) - 1;".format(self.tablePrefix),
+                                (firstId,))
+            self.executeCommand("DROP TABLE temp.renumber;")
+
+    def selectRandomIds(self, n):
+        """ Return a list with n random ids from the Objects table.
+        Only the ids are sorted, and sqlite keeps just the n first ones.
+        """
+        self.executeCommand("SELECT id %s ORDER BY RANDOM() LIMIT ?" % self.FROM, (n,))
+        return [row[0] for row in self.cursor.fetchall()]
+
+    @contextmanager
+    def _attachObjects(self, otherDbName, otherTablePrefix=''):
+        """ Attach otherDbName as otherDb during the context, yielding
+        the name of its Objects table or None if it does not exist.
+        Only the rows committed in otherDbName are visible.
+        ATTACH is not allowed within a transaction, so pending changes
+        (e.g. appended items) are committed first. This can not be done
+        inside transaction() (or batchInsert), since it would commit
+        the transaction of the caller.
+        """
+        if self.isInTransaction():
+            raise Exception("Can not attach %s to %s inside a transaction, "
+                            "it would commit it." % (otherDbName, self.getDbName()))
+        otherTablePrefix = otherTablePrefix.strip()
+        if otherTablePrefix and not otherTablePrefix.endswith('_'):
+            otherTablePrefix += '_'
+        self.commit()
+        self.executeCommand("ATTACH DATABASE ? AS otherDb", (otherDbName,))
+        try:
+            otherObjects = '%sObjects' % otherTablePrefix
+            if not self.executeCommand("SELECT name FROM otherDb.sqlite_master WHERE type='table'"
+                                       " AND name=?", (otherObjects,)).fetchone():
+                otherObjects = None
+            yield 'otherDb.%s' % otherObjects if otherObjects else None
+        finally:
+            self.commit()
+            self.executeCommand("DETACH DATABASE otherDb")
+
+    def hasCommonIds(self, otherDbName, otherTablePrefix=''):
+        """ Return True if any id of the Objects table is also present in
+        the Objects table of otherDbName. The other db is attached so the
+        check is done by sqlite, stopping at the first match.
+        """
+        with self._attachObjects(otherDbName, otherTablePrefix) as otherObjects:
+            if otherObjects is None:
+                return False
+            self.executeCommand("SELECT EXISTS(SELECT 1 %s WHERE id IN "
+                                "(SELECT id FROM %s))" % (self.FROM, otherObjects))
+            return bool(self.cursor.fetchone()[0])
+
+    def copyObjects(self, otherDbName, otherTablePrefix=''):
+        """ Copy all the rows of the Objects table of otherDbName (that
+        should have the same columns) with a single INSERT ... SELECT.
+        Ids are kept, so they should not be already present.
+        Return the number of copied rows.
+        """
+        with self._attachObjects(otherDbName, otherTablePrefix) as otherObjects:
+            if otherObjects is None:
+                return 0
+            with self.transaction():
+                self.executeCommand("INSERT INTO %sObjects SELECT * FROM %s"
+                                    % (self.tablePrefix, otherObjects))
+                return self.cursor.rowcount
+
     # FIXME: Seems to be duplicated and a subset of selectAll
     def selectObjectsBy(self, iterate=False, **args):
         """More flexible select where the constrains can be passed
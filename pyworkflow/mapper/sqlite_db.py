@@ -31,6 +31,7 @@ This module contains some sqlite basic tools to handle Databases.
 
 import logging
 logger = logging.getLogger(__name__)
+from contextlib import contextmanager
 from sqlite3 import dbapi2 as sqlite
 from sqlite3 import OperationalError as OperationalError
 from pyworkflow.utils import STATUS, getExtraLogInfo, Config
@@ -41,6 +42,7 @@ class SqliteDb:
     It will create connection, execute queries and commands.
     """
     OPEN_CONNECTIONS = {}  # Store all connections made
+    _transactionOpened = False  # True inside the context that opened a transaction
 
     def __init__(self):
         self._reuseConnections = False
@@ -79,6 +81,36 @@ class SqliteDb:
 
     def getDbName(self):
         return self._dbName
+
+    @contextmanager
+    def transaction(self):
+        """ Execute all the commands inside the context in a single
+        transaction (so sqlite only syncs to disk once). Changes are
+        committed at the end or rolled back if any error happens.
+        If a transaction is already open, the commands are just part of it
+        and it is left to its owner to commit or roll it back.
+        """
+        if self.connection.in_transaction:
+            yield self
+            return
+
+        self.executeCommand("BEGIN")
+        self._transactionOpened = True
+        try:
+            yield self
+        except Exception:
+            self.connection.rollback()
+            raise
+        else:
+            self.commit()
+        finally:
+            self._transactionOpened = False
+
+    def isInTransaction(self):
+        """ Return True if inside the context of transaction(), as opposed
+        to the implicit transactions opened by sqlite3 before inserts.
+        """
+        return self._transactionOpened
     
     def close(self):
         self.connection.close()
@@ -33,7 +33,8 @@ logger = logging.getLogger(__name__)
 
 from collections import OrderedDict
 import datetime as dt
-from os.path import getmtime
+import random
+from os.path import getmtime, exists
 
 from pyworkflow.utils import getListFromValues, getListFromRangeString, strToDuration
 from pyworkflow.utils.reflection import getSubclasses
@@ -1132,6 +1133,7 @@ class Set(Object):
         self._representative = None
         self._classesDict = classesDict
         self._indexes = kwargs.get('indexes', [])
+        self._itemAttrNames = None  # cached names of the items attributes
         # If filename is passed in the constructor, it means that
         # we want to create a new object, so we need to delete it if
         # the file exists
@@ -1232,6 +1234,62 @@ class Set(Object):
                                            limit=limit,
                                            iterate=iterate)  # has flat mapper, iterate is true
 
+    def iterItemsInChunks(self, chunkSize=8192):
+        """ Iterate over the items (sorted by id) reading chunkSize rows
+        per query. Memory is bounded by the chunk size and the database
+        cursor is free between chunks, so it is safe to query the set
+        (e.g. set[itemId]) while iterating.
+        """
+        return self._getMapper().selectAllByChunks(chunkSize=chunkSize)
+
+    def iterItemsByIds(self, ids, chunkSize=900):
+        """ Iterate over the items whose id is in ids (sorted by id).
+        A single query is done for every chunkSize ids, so this is much
+        faster than retrieving each item with set[itemId]. e.g. to iterate
+        over the items of a full set that are present in a subset::
+
+            for item in fullSet.iterItemsByIds(subset.getIdSet()):
+                ...
+        """
+        ids = sorted(ids)
+
+        for i in range(0, len(ids), chunkSize):
+            idsStr = ','.join(str(int(itemId)) for itemId in ids[i:i + chunkSize])
+            for item in self.iterItems(where='id IN (%s)' % idsStr):
+                yield item
+
+    def renumberItems(self, firstId=1):
+        """ Renumber the items ids (keeping their order) to be
+        consecutive starting at firstId. This is done in sqlite, so
+        items can be appended with their original ids and renumbered
+        at the end, instead of setting the id of every item.
+        """
+        mapper = self._getMapper()
+        mapper.renumberIds(firstId)
+        self._idCount = mapper.maxId() or 0
+
+    def iterRandomItems(self, n):
+        """ Iterate over n items randomly chosen (sorted by id).
+        The random ids are selected in sqlite, so only the chosen
+        items are loaded, e.g. to create a random subset.
+        """
+        return self.iterItemsByIds(self._getMapper().randomIds(n))
+
+    def iterItemsSplit(self, sizes, randomize=False):
+        """ Iterate the items in id order, yielding (subsetIndex, item)
+        pairs, with sizes[i] items going to the subset i.
+        If randomize is True, the items are randomly distributed among
+        the subsets. Instead of sorting the table by RANDOM(), the
+        subset indexes are shuffled, so the items are still read
+        sequentially from the database.
+        """
+        targets = [i for i, n in enumerate(sizes) for _ in range(n)]
+        if randomize:
+            random.shuffle(targets)
+        for target, item in zip(targets, self.iterItems(orderBy='id',
+                                                        direction='ASC')):
+            yield target, item
+
     def getFirstItem(self):
         """ Return the first item in the Set. """
         # This function is used in many contexts where the mapper can be
@@ -1279,10 +1337,9 @@ class Set(Object):
 
         """
         if properties:
-            self._getMapper().setProperty('self', self.getClassName())
-            objDict = self.getObjDict()
-            for key, value in objDict.items():
-                self._getMapper().setProperty(key, value)
+            objDict = OrderedDict([('self', self.getClassName())])
+            objDict.update(self.getObjDict())
+            self._getMapper().setProperties(objDict)
         self._getMapper().commit()
     
     def _loadClassesDict(self):
@@ -1314,6 +1371,7 @@ class Set(Object):
     def clear(self):
         self._mapper.clear()
         self._idCount = 0
+        self._itemAttrNames = None
         self._size.set(0)
          
     def append(self, item):
@@ -1321,6 +1379,12 @@ class Set(Object):
         If the item has already an id, use it.
         If not, keep a counter with the max id
         and assign the next one.
+
+        The set does not keep a reference to the item, its values are
+        written to the database. So there is no need to clone an item
+        before appending it: the same object can be modified and
+        appended again (resetting its id with setObjId(None) if a new
+        id has to be assigned).
         """
         # The _idCount and _size properties work fine
         # under the assumption that once a Set is stored,
@@ -1343,6 +1407,30 @@ class Set(Object):
     def update(self, item):
         """ Update an existing item. """
         self._getMapper().update(item)
+
+    def transaction(self):
+        """ Return a context manager to group several operations on the
+        set items (e.g. appending many items) in a single database
+        transaction. Changes are committed at the end or rolled back
+        if any error happens::
+
+            with outputSet.transaction():
+                for item in inputSet:
+                    outputSet.append(item)
+        """
+        return self._getMapper().transaction()
+
+    def batchAppend(self, batchSize=1000):
+        """ Return a context manager to append many items faster. Inside
+        it, items rows are written in batches of batchSize (and all in a
+        single transaction). Buffered items are not visible to queries on
+        the set until the context is left::
+
+            with outputSet.batchAppend():
+                for item in inputSet:
+                    outputSet.append(item)
+        """
+        return self._getMapper().batchInsert(batchSize)
                 
     def __str__(self):
         return "%-20s (%d items%s)" % (self.getClassName(), self.getSize(),
@@ -1404,6 +1492,63 @@ class Set(Object):
     def getIdSet(self):
         """ Return a Python set object containing all ids. """
         return set(self.getUniqueValues('id'))
+
+    def getItemAttributeNames(self):
+        """ Return the names of the items attributes stored in the set
+        (e.g. _samplingRate, _acquisition._voltage), read from the set
+        metadata without loading any item. The result is cached for
+        non-empty sets.
+        """
+        if not self._itemAttrNames:
+            self._itemAttrNames = self._getMapper().getAttributeNames()
+        return self._itemAttrNames
+
+    def getItemSchema(self):
+        """ Return a tuple with the (attribute name, class name) pairs
+        stored for the items, including ('self', itemClassName). Sets
+        with equal schemas store the same kind of items, so this can be
+        used to validate sets before merging them, without loading any
+        item. An empty tuple is returned for empty sets.
+        """
+        return self._getMapper().getSchema()
+
+    def getMaxId(self):
+        """ Return the maximum item id stored in the set (0 if empty).
+        It is a single sql query, no items are loaded.
+        """
+        return self._getMapper().maxId() or 0
+
+    def appendFromSet(self, other):
+        """ Append all the items of other set, keeping their ids, copying
+        the rows directly in sqlite instead of loading and appending
+        each item. Both sets should store the same kind of items (see
+        getItemSchema) and not share any id (see hasCommonIds).
+        The rows are copied in their own transaction, so this can not be
+        called inside transaction() or batchAppend().
+        """
+        otherSchema = other.getItemSchema()
+        if not otherSchema:
+            return
+        schema = self.getItemSchema()
+        if schema and schema != otherSchema:
+            raise Exception("Can not append items from %s: different items schema.\n"
+                            "%s\n%s" % (other.getFileName(), schema, otherSchema))
+
+        mapper = self._getMapper()
+        copied = mapper.copyObjects(other.getFileName(), other.getPrefix() or '',
+                                    otherSchema)
+        self._size.set(self._size.get() + copied)
+        self._idCount = max(self._idCount, mapper.maxId() or 0)
+
+    def hasCommonIds(self, other):
+        """ Return True if this set and the other one share any item id.
+        The check is done in sqlite, without loading the ids in python,
+        and can be used before a union to know if ids need to be renumbered.
+        """
+        fn = other.getFileName()
+        if fn is None or not exists(fn):
+            return False
+        return self._getMapper().hasCommonIds(fn, other.getPrefix() or '')
     
     def getFiles(self):
         files = set()
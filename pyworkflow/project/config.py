@@ -29,9 +29,17 @@ logger = logging.getLogger(__name__)
 import json
 import datetime as dt
 
+from pyworkflow import Config
 import pyworkflow.object as pwobj
 from pyworkflow.mapper import SqliteMapper
 
+# Pragmas applied to the settings db when SCIPION_SQLITE_TUNE is active
+SQLITE_TUNE_PRAGMAS = {'journal_mode': 'WAL',
+                       'synchronous': 'NORMAL',
+                       'temp_store': 'MEMORY',
+                       'cache_size': -40000,  # in KiB
+                       'mmap_size': 268435456}
+
 
 class ProjectSettings(pwobj.Object):
     """ Store settings related to a project. """
@@ -135,8 +143,12 @@ class ProjectSettings(pwobj.Object):
                 raise Exception("Can't write ProjectSettings without "
                                 "mapper or dbPath")
 
-        self.mapper.deleteAll()
-        self.mapper.insert(self)
+        # Replace the stored settings in a single transaction
+        with self.mapper.transaction():
+            self.mapper.deleteAll()
+            self.mapper.insert(self)
+        # The transaction is not committed by the context if it was
+        # already open (e.g. implicitly by previous changes)
         self.mapper.commit()
 
     def getNodes(self):
@@ -153,6 +165,8 @@ class ProjectSettings(pwobj.Object):
         try:
             logger.info("Cleaning up unused graphical nodes.")
 
+            # Use a set for O(1) membership tests, runsIds could be a long list
+            runsIds = set(runsIds)
             nodesToDelete = []
             for node  in self.getNodes():
                 nodeId = str(node.getId())
@@ -163,8 +177,7 @@ class ProjectSettings(pwobj.Object):
                         nodesToDelete.append(node.getId())
 
             logger.info("Following graphical nodes %s unmatched. Deleting them" % nodesToDelete)
-            for key in nodesToDelete:
-                self.getNodes().removeNode(key)
+            self.getNodes().removeNodes(nodesToDelete)
                 
         except Exception as e:
             logger.error("Couldn't clean up graphical nodes.", exc_info=e)
@@ -188,6 +201,10 @@ class ProjectSettings(pwobj.Object):
         classDict = dict(globals())
         classDict.update(pwobj.__dict__)
         mapper = SqliteMapper(dbPath, classDict)
+
+        if Config.sqliteTuneOn():
+            cls._tuneMapper(mapper)
+
         settingList = mapper.selectByClass('ProjectSettings')
         n = len(settingList)
 
@@ -202,11 +219,25 @@ class ProjectSettings(pwobj.Object):
 
         return settings
 
+    @staticmethod
+    def _tuneMapper(mapper):
+        """ Apply the SQLITE_TUNE_PRAGMAS to the mapper connection. """
+        try:
+            for pragma in SQLITE_TUNE_PRAGMAS.items():
+                mapper.db.executeCommand("PRAGMA %s=%s" % pragma)
+        except Exception as e:
+            logger.warning("Couldn't tune the settings db connection: %s" % e)
+
 
 class MenuConfig(object):
     """Menu configuration in a tree fashion.
     Each menu can contain submenus.
     Leaf elements can contain actions"""
+    # Menu trees can have thousands of nodes (e.g. the protocols tree),
+    # so keep the known attributes in slots. __dict__ is kept so items can
+    # still hold extra attributes; it is only created when one is set.
+    __slots__ = ('text', 'value', 'icon', 'tag', 'shortCut', 'openItem',
+                 'visible', 'childs', '__dict__')
 
     def __init__(self, text=None, value=None,
                  icon=None, tag=None, shortCut=None, openItem=False, visible=True):
@@ -225,7 +256,7 @@ class MenuConfig(object):
         self.shortCut = shortCut
         self.openItem = openItem
         self.visible = visible
-        self.childs = pwobj.List()
+        self.childs = []
 
     def addSubMenu(self, text, value=None, **args):
         subMenu = type(self)(text, value, **args)
@@ -250,12 +281,14 @@ class NodeConfig(pwobj.Scalar):
                  visible=True):
         pwobj.Scalar.__init__(self)
         # Special node id 0 for project node
+        # Plain values are stored, visible may come as a string ('false')
+        # so it is parsed by Boolean
         self._values = {'id': nodeId,
-                        'x': pwobj.Integer(x).get(0),
-                        'y': pwobj.Integer(y).get(0),
+                        'x': 0 if x is None else int(x),
+                        'y': 0 if y is None else int(y),
                         'selected': selected,
                         'expanded': expanded,
-                        'visible': pwobj.Boolean(visible).get(0),
+                        'visible': pwobj.Boolean(visible).get(False),
                         'labels': []}
 
     def _convertValue(self, value):
@@ -344,14 +377,23 @@ class NodeConfigList(pwobj.List):
 
     def removeNode(self, nodeId):
         """ Removes a node with the id = nodeId"""
-        nodeToRemove = self._nodesDict[nodeId]
-        self._nodesDict.pop(nodeId)
-        self.remove(nodeToRemove)
+        self.removeNodes([nodeId])
+
+    def removeNodes(self, nodeIds):
+        """ Removes all the nodes with the given ids in a single pass.
+        Nodes are matched by identity, avoiding the value comparison
+        (json serialization) that list.remove would do for each node.
+        """
+        # Look up all the nodes first, so an unknown id (KeyError)
+        # leaves both the dict and the list untouched
+        nodes = [self._nodesDict[nodeId] for nodeId in nodeIds]
+        for nodeId in nodeIds:
+            self._nodesDict.pop(nodeId, None)
+        nodesToRemove = {id(node) for node in nodes}
+        self[:] = [node for node in self if id(node) not in nodesToRemove]
 
     def updateDict(self):
-        self._nodesDict.clear()
-        for node in self:
-            self._nodesDict[node.getId()] = node
+        self._nodesDict = {node.getId(): node for node in self}
 
     def clear(self):
         pwobj.List.clear(self)
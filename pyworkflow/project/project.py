@@ -349,7 +349,7 @@ class Project(object):
         if hostName in self._hosts:
             hostKey = hostName
         else:
-            hostKey = self.getHostNames()[0]
+            hostKey = next(iter(self._hosts))  # first host, no need to list all
             logger.warning("Protocol host '%s' not found." % hostName)
             logger.warning("         Using '%s' instead." % hostKey)
 
@@ -31,11 +31,14 @@ execution hosts.
 
 import os
 import sys
-import json
-from configparser import RawConfigParser
+try:
+    from orjson import loads as jsonLoads
+except ImportError:
+    from json import loads as jsonLoads
 from collections import OrderedDict
 
 import pyworkflow as pw
+import pyworkflow.utils as pwutils
 from pyworkflow.object import Object, String, Integer
 
 
@@ -152,44 +155,44 @@ class HostConfig(Object):
             f.write('[localhost]\nPARALLEL_COMMAND = '
                     'mpirun -np %_(JOB_NODES)d --map-by node %_(COMMAND)s\n')
 
+    @staticmethod
+    def _fixValue(value):
+        """ Convert a value read from the hosts file. This is done once
+        per value when the file is parsed (values are cached after that).
+        """
+        # Rescue python2.7 behaviour: ## at the beginning of a line, means a single #.
+        # https://github.com/scipion-em/scipion-pyworkflow/issues/70
+        value = value.replace("\n##", "\n#")
+
+        # Keep compatibility: %_ --> %%
+        return value.replace('%_(', '%(')
+
     @classmethod
     def load(cls, hostsConf):
         """ Load several hosts from a configuration file.
         Return an dictionary with hostName -> hostConfig pairs.
         """
-        # Read from users' config file. Raw to avoid interpolation of %: we expect %_
-        cp = RawConfigParser(comment_prefixes=";")
-        cp.optionxform = str  # keep case (stackoverflow.com/questions/1611799)
+        # Read from users' config file. No interpolation of %: we expect %_
         hosts = OrderedDict()
 
         try:
-            assert cp.read(hostsConf) != [], 'Missing file %s' % hostsConf
+            assert os.path.exists(hostsConf), 'Missing file %s' % hostsConf
+            sections = pwutils.readIniFile(hostsConf, commentPrefixes=(';',),
+                                           valueConverter=cls._fixValue)
 
-            for hostName in cp.sections():
+            for hostName, options in sections.items():
                 host = HostConfig(label=hostName, hostName=hostName)
                 host.setHostPath(pw.Config.SCIPION_USER_DATA)
 
                 # Helper functions (to write less)
                 def get(var, default=None):
-                    if cp.has_option(hostName, var):
-
-                        value = cp.get(hostName, var)
-                        # Rescue python2.7 behaviour: ## at the beginning of a line, means a single #.
-                        # https://github.com/scipion-em/scipion-pyworkflow/issues/70
-                        value = value.replace("\n##", "\n#")
-
-                        # Keep compatibility: %_ --> %%
-                        value = value.replace('%_(', '%(')
-
-                        return value
-                    else:
-                        return default
+                    return options.get(var, default)
 
                 def getDict(var):
                     od = OrderedDict()
 
-                    if cp.has_option(hostName, var):
-                        for key, value in json.loads(get(var)).items():
+                    if var in options:
+                        for key, value in jsonLoads(get(var)).items():
                             od[key] = value
 
                     return od
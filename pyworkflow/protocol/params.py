@@ -201,6 +201,10 @@ class Form(object):
         self._paramsDict = collections.OrderedDict()
         self._lastSection = None
         self._protocol = protocol
+        # Globals and compiled code used to evaluate the params conditions,
+        # built only once since conditions are evaluated very often
+        self._conditionGlobals = None
+        self._conditionCodes = {}
         self.addGeneralSection()
         
     def getClass(self):
@@ -261,16 +265,34 @@ class Form(object):
             return True
         condStr = param.condition.get()
         localDict = {}
-        globalDict = dict(globals())
-        # FIXME: Check why this import is here
-        from pyworkflow import Config
-        globalDict.update(Config.getDomain().getObjects())
 
         for t in param._conditionParams:
             if self.hasParam(t) or self._protocol.hasAttribute(t):
                 localDict[t] = self._protocol.getAttributeValue(t)
 
-        return eval(condStr, globalDict, localDict)
+        return eval(self._getConditionCode(condStr),
+                    self._getConditionGlobals(), localDict)
+
+    def _getConditionGlobals(self):
+        """ Return the globals dict used to evaluate conditions. """
+        if self._conditionGlobals is None:
+            globalDict = dict(globals())
+            # FIXME: Check why this import is here
+            from pyworkflow import Config
+            globalDict.update(Config.getDomain().getObjects())
+            self._conditionGlobals = globalDict
+
+        return self._conditionGlobals
+
+    def _getConditionCode(self, condStr):
+        """ Return the compiled code of a condition string. """
+        code = self._conditionCodes.get(condStr)
+
+        if code is None:
+            code = compile(condStr, '<condition>', 'eval')
+            self._conditionCodes[condStr] = code
+
+        return code
     
     def validateParams(self, protocol):
         """ Check that all validations of the params in the form
@@ -35,6 +35,7 @@ def hasLabel(TestClass, labels):
 
 class DataSet:
     _datasetDict = {}  # store all created datasets
+    _syncedDatasets = set()  # datasets already downloaded by this process
 
     def __init__(self, name, folder, files, url=None):
         """ 
@@ -59,7 +60,9 @@ class DataSet:
     @classmethod
     def getDataSet(cls, name):
         """
-        This method is called every time the dataset want to be retrieved
+        This method is called every time the dataset want to be retrieved.
+        The dataset is only synchronized the first time it is retrieved
+        by this process.
         """
         assert name in cls._datasetDict, "Dataset: %s dataset doesn't exist." % name
 
@@ -67,11 +70,12 @@ class DataSet:
         folder = ds.folder
         url = '' if ds.url is None else ' -u ' + ds.url
 
-        if not pw.Config.SCIPION_TEST_NOSYNC:
+        if not pw.Config.SCIPION_TEST_NOSYNC and name not in cls._syncedDatasets:
             command = ("%s %s --download %s %s"
                        % (pw.PYTHON, pw.getSyncDataScript(), folder, url))
             logger.info(">>>> %s" % command)
-            os.system(command)
+            if os.system(command) == 0:
+                cls._syncedDatasets.add(name)
 
         return cls._datasetDict[name]
 
@@ -156,12 +160,14 @@ class BaseTest(unittest.TestCase):
     @classmethod
     def _waitOutput(cls, prot, outputAttributeName, sleepTime=20, timeOut=5000):
         """ Wait until the output is being generated by the protocol. """
+        # These do not change while waiting
+        projPath = prot.getProject().path
+        dbPath = prot.getDbPath()
+        protId = prot.getObjId()
 
         def _loadProt():
             # Load the last version of the protocol from its own database
-            loadedProt = getProtocolFromDb(prot.getProject().path,
-                                           prot.getDbPath(),
-                                           prot.getObjId())
+            loadedProt = getProtocolFromDb(projPath, dbPath, protId)
             # Close DB connections
             loadedProt.getProject().closeMapper()
             loadedProt.closeMappers()
@@ -32,6 +32,7 @@ import re
 from datetime import datetime, timezone
 import traceback
 import sysconfig
+from collections import OrderedDict
 
 import bibtexparser
 import numpy as np
@@ -751,6 +752,100 @@ def readProperties(propsFile):
     return myprops
 
 
+# Cache for readIniFile: (iniFile, commentPrefixes) -> (mtime, size, sections)
+_iniCache = {}
+
+_INI_SECTION_RE = re.compile(r"\[(?P<header>.+)\]")
+_INI_OPTION_RE = re.compile(r"(?P<option>.*?)\s*[=:]\s*(?P<value>.*)$")
+_INI_NONSPACE_RE = re.compile(r"\S")
+
+
+def readIniFile(iniFile, commentPrefixes=('#', ';'), valueConverter=None):
+    """ Read an .ini like file (as configparser does, keeping the case of the
+    options and without any interpolation) and return an OrderedDict with
+    section -> OrderedDict(option -> value).
+
+    Parsed files are cached by modification time and size, so reading the
+    same unchanged file again does not parse it. The returned dictionaries
+    are shared, do not modify them.
+
+    :param iniFile: path to the file to read.
+    :param commentPrefixes: prefixes of the full line comments.
+    :param valueConverter: optional function applied once to every value
+        when the file is parsed, so the converted values are also cached.
+    """
+    st = os.stat(iniFile)
+    key = (iniFile, tuple(commentPrefixes), valueConverter)
+    cached = _iniCache.get(key)
+
+    if cached is not None and cached[0] == st.st_mtime and cached[1] == st.st_size:
+        return cached[2]
+
+    sections = OrderedDict()
+    section = None
+    option = None
+    indentLevel = 0
+
+    with open(iniFile) as f:
+        for lineno, line in enumerate(f, start=1):
+            isComment = line.strip().startswith(tuple(commentPrefixes))
+            value = '' if isComment else line.strip()
+
+            if not value:
+                # Empty lines are kept inside multiline values
+                if not isComment and option is not None:
+                    section[option].append('')
+                continue
+
+            curIndentLevel = _INI_NONSPACE_RE.search(line).start()
+
+            # Continuation line of a multiline value
+            if option is not None and curIndentLevel > indentLevel:
+                section[option].append(value)
+                continue
+
+            indentLevel = curIndentLevel
+            match = _INI_SECTION_RE.match(value)
+
+            if match:
+                header = match.group('header')
+                if header in sections:
+                    raise Exception("%s (line %d): duplicated section '%s'"
+                                    % (iniFile, lineno, header))
+                section = sections[header] = OrderedDict()
+                option = None
+            elif section is None:
+                raise Exception("%s (line %d): missing section header"
+                                % (iniFile, lineno))
+            else:
+                match = _INI_OPTION_RE.match(value)
+                if not match or not match.group('option'):
+                    raise Exception("%s (line %d): can not parse '%s'"
+                                    % (iniFile, lineno, line.rstrip()))
+                option = match.group('option').rstrip()
+                if option in section:
+                    raise Exception("%s (line %d): duplicated option '%s'"
+                                    % (iniFile, lineno, option))
+                section[option] = [match.group('value').strip()]
+
+    for options in sections.values():
+        for k, lines in options.items():
+            value = '\n'.join(lines).rstrip()
+            options[k] = value if valueConverter is None else valueConverter(value)
+
+    # As configparser, DEFAULT values are available in all the sections
+    defaults = sections.pop('DEFAULT', None)
+
+    if defaults:
+        for options in sections.values():
+            for k, v in defaults.items():
+                options.setdefault(k, v)
+
+    _iniCache[key] = (st.st_mtime, st.st_size, sections)
+
+    return sections
+
+
 # ---------------------Color utils --------------------------
 def hex_to_rgb(value):
     value = value.lstrip('#')
@@ -240,6 +240,33 @@ class TestSqliteMapper(pwtests.BaseTest):
         self.assertTrue(pwobj.Integer(4) not in iList3)
         self.assertTrue(pwobj.Integer(3) in iList3)
 
+    def test_transaction(self):
+        """ Check changes inside a transaction are committed together
+        or rolled back if something fails. """
+        fn = self.getOutputPath("transaction.sqlite")
+        mapper = pwmapper.SqliteMapper(fn, pw.Config.getDomain().getMapperDict())
+
+        with mapper.transaction():
+            mapper.insert(pwobj.Integer(1))
+            mapper.insert(pwobj.Integer(2))
+
+        with self.assertRaises(ValueError):
+            with mapper.transaction():
+                mapper.deleteAll()
+                raise ValueError("Something went wrong")
+
+        # A nested transaction does not commit the outer one
+        with self.assertRaises(ValueError):
+            with mapper.transaction():
+                with mapper.transaction():
+                    mapper.insert(pwobj.Integer(3))
+                raise ValueError("Something went wrong")
+        mapper.close()
+
+        mapper2 = pwmapper.SqliteMapper(fn, pw.Config.getDomain().getMapperDict())
+        self.assertEqual(len(mapper2.selectByClass('Integer')), 2)
+        mapper2.close()
+
 
 class TestSqliteFlatMapper(pwtests.BaseTest):
     """ Some tests for DataSet implementation. """
@@ -361,6 +388,30 @@ class TestSqliteFlatMapper(pwtests.BaseTest):
         items = [obj.clone() for obj in objSet]
         self.assertEqual(len(items), 0)
 
+    def test_enableAppend(self):
+        dbName = self.getOutputPath('append.sqlite')
+        mapper = pwmapper.SqliteFlatMapper(dbName, pw.Config.getDomain().getMapperDict())
+        for i in range(1, 4):
+            img = MockImage()
+            img.setLocation(i, IMAGES_STK)
+            mapper.insert(img)
+        mapper.commit()
+        mapper.close()
+
+        # Reopen the db and append more items, as streaming protocols do
+        mapper2 = pwmapper.SqliteFlatMapper(dbName, pw.Config.getDomain().getMapperDict())
+        mapper2.enableAppend()
+        img = MockImage()
+        img.setLocation(4, IMAGES_STK)
+        img.setSamplingRate(2.0)
+        mapper2.insert(img)
+        mapper2.commit()
+
+        self.assertEqual(4, mapper2.count())
+        lastImg = mapper2.selectById(4)
+        self.assertEqual((4, IMAGES_STK), lastImg.getLocation())
+        self.assertEqual(2.0, lastImg.getSamplingRate())
+
 
 class TestDataSet(pwtests.BaseTest):
     """ Some tests for DataSet implementation. """
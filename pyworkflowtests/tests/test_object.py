@@ -32,6 +32,7 @@ import os
 from logging import DEBUG, lastResort
 from time import sleep
 
+from pyworkflow import Config
 import pyworkflow.object as pwobj
 import pyworkflow.tests as pwtests
 from pyworkflow.mapper.sqlite import ID, CREATION
@@ -344,6 +345,46 @@ class TestObject(pwtests.BaseTest):
         self.assertIsInstance(ids, set, "getIdSet does not return a set")
         self.assertIsInstance(next(iter(ids)), int, "getIdSet items are not integer")
         self.assertEqual(len(ids), 10, "getIdSet does not return 10 items")
+        self.assertEqual(imgSet.getMaxId(), 10, "getMaxId does not return the max id")
+        self.assertEqual(imgSet.getItemAttributeNames(), ['_index', '_filename', '_samplingRate'],
+                         "getItemAttributeNames does not return the stored attributes")
+        self.assertEqual(imgSet.getItemSchema(), (('self', 'MockImage'), ('_index', 'Integer'),
+                                                  ('_filename', 'String'), ('_samplingRate', 'Float')),
+                         "getItemSchema does not return the stored schema")
+
+        # Check common ids with other sets
+        otherSet = MockSetOfImages(filename=self.getOutputPath('test_commonIds.sqlite'))
+        otherSet.append(MockImage(location=(1, 'other.mrc')))
+        otherSet.write()
+        self.assertTrue(imgSet.hasCommonIds(otherSet), "hasCommonIds does not find common ids")
+        otherSet.clear()
+        otherSet.append(MockImage(location=(1, 'other.mrc'), objId=20))
+        otherSet.write()
+        self.assertFalse(imgSet.hasCommonIds(otherSet), "hasCommonIds finds wrong common ids")
+        # It would commit the transaction of the caller
+        with self.assertRaisesRegex(Exception, "inside a transaction"):
+            with imgSet.transaction():
+                imgSet.hasCommonIds(otherSet)
+
+        # Append all the items of another set in sqlite
+        fullSet = MockSetOfImages(filename=self.getOutputPath('test_appendFromSet.sqlite'))
+        # It would commit the transaction of the caller
+        with self.assertRaisesRegex(Exception, "inside a transaction"):
+            with fullSet.transaction():
+                fullSet.appendFromSet(imgSet)
+        self.assertEqual(fullSet.getSize(), 0)
+        fullSet.appendFromSet(imgSet)
+        fullSet.appendFromSet(otherSet)
+        self.assertSetSize(fullSet, 11)
+        self.assertEqual([item.getObjId() for item in fullSet], list(range(1, 11)) + [20],
+                         "appendFromSet does not copy the items")
+        self.assertEqual(fullSet[20].getFileName(), 'other.mrc', "appendFromSet does not copy the items values")
+
+        # Renumber items ids in sqlite
+        otherSet.append(MockImage(location=(2, 'other.mrc'), objId=35))
+        otherSet.renumberItems(firstId=5)
+        self.assertEqual([(item.getObjId(), item.getIndex()) for item in otherSet], [(5, 1), (6, 2)],
+                         "renumberItems does not renumber the ids in order")
 
         # Request item by id
         item = imgSet[1]
@@ -353,6 +394,30 @@ class TestObject(pwtests.BaseTest):
         item = imgSet.getItem("id", 2)
         self.assertEqual(item.getObjId(), 2, "Item accessed field id does not work")
 
+        # Iterate items in chunks, querying the set in between
+        result = [(item.getObjId(), imgSet[item.getObjId()].getIndex()) for item in imgSet.iterItemsInChunks(3)]
+        self.assertEqual(result, [(i, i) for i in range(1, 11)], "Items iterated in chunks are wrong")
+
+        # Iterate items by ids, in several chunks and ignoring missing ids
+        result = [item.getObjId() for item in imgSet.iterItemsByIds({9, 2, 5, 7, 100}, chunkSize=2)]
+        self.assertEqual(result, [2, 5, 7, 9], "Items iterated by ids are wrong")
+
+        # Iterate random items, sorted by id
+        result = [item.getObjId() for item in imgSet.iterRandomItems(4)]
+        self.assertEqual(len(set(result)), 4, "Random items are not 4 different items")
+        self.assertEqual(result, sorted(result), "Random items are not sorted by id")
+        self.assertEqual(len(list(imgSet.iterRandomItems(20))), 10, "Random items exceed the set size")
+
+        # Split items in subsets, reading them in id order
+        result = [(target, item.getObjId()) for target, item in imgSet.iterItemsSplit([3, 7])]
+        self.assertEqual(result, [(0, 1), (0, 2), (0, 3)] + [(1, i) for i in range(4, 11)],
+                         "Items split is wrong")
+        result = [(target, item.getObjId()) for target, item in imgSet.iterItemsSplit([5, 5], randomize=True)]
+        self.assertEqual([objId for _, objId in result], list(range(1, 11)),
+                         "Items randomly split are not read in id order")
+        self.assertEqual(sum(1 for target, _ in result if target == 0), 5,
+                         "Items randomly split are not distributed by sizes")
+
         # Test load properties queries
         from pyworkflow.mapper.sqlite_db import logger
         logger.setLevel(DEBUG)
@@ -364,6 +429,92 @@ class TestObject(pwtests.BaseTest):
         self.compareSetProperties(imgSet, imgSetVerbose, ignore=[])
 
 
+    def test_setTransaction(self):
+        fn = self.getOutputPath('test_transaction.sqlite')
+        imgSet = MockSetOfImages(filename=fn)
+
+        with imgSet.transaction():
+            for i in range(5):
+                img = MockImage()
+                img.setLocation(i + 1, IMAGES_STK)
+                imgSet.append(img)
+
+        imgSet.write()
+        imgSet.close()
+        self.assertSetSize(MockSetOfImages(filename=fn), 5)
+
+    def test_setBatchAppend(self):
+        fn = self.getOutputPath('test_batch_append.sqlite')
+        imgSet = MockSetOfImages(filename=fn, indexes=['_index'])
+
+        def getIndexes(db):
+            db.executeCommand("SELECT name FROM sqlite_master WHERE type='index'")
+            return [row[0] for row in db.cursor.fetchall()]
+
+        with imgSet.batchAppend(batchSize=3):
+            for i in range(10):
+                img = MockImage()
+                img.setLocation(i + 1, IMAGES_STK)
+                imgSet.append(img)
+            # Indexes of a new set are only created at the end
+            self.assertNotIn('index__index', getIndexes(imgSet._getMapper().db))
+
+        imgSet.write()
+        imgSet.close()
+
+        imgSet = MockSetOfImages(filename=fn)
+        self.assertSetSize(imgSet, 10)
+        self.assertEqual(list(range(1, 11)), [img.getIndex() for img in imgSet])
+
+        db = imgSet._getMapper().db
+        self.assertIn('index__index', getIndexes(db))
+
+        # With sqlite batch tuning, pragmas are restored after the batch
+        tuneOn = Config.SCIPION_SQLITE_BATCH_TUNE
+        Config.SCIPION_SQLITE_BATCH_TUNE = True
+        imgSet.enableAppend()
+        try:
+            with imgSet.batchAppend():
+                imgSet.append(MockImage(location=(11, IMAGES_STK)))
+                # Indexes of an existing set are kept
+                self.assertIn('index__index', getIndexes(db))
+                db.executeCommand("PRAGMA cache_size;")
+                self.assertEqual(db.cursor.fetchone()[0], -200000, "Pragmas not set in batchAppend")
+
+            # Pragmas are not set inside an already open transaction
+            imgSet.append(MockImage(location=(12, IMAGES_STK)))
+            with imgSet.batchAppend():
+                imgSet.append(MockImage(location=(13, IMAGES_STK)))
+                db.executeCommand("PRAGMA cache_size;")
+                self.assertNotEqual(db.cursor.fetchone()[0], -200000)
+        finally:
+            Config.SCIPION_SQLITE_BATCH_TUNE = tuneOn
+        self.assertSetSize(imgSet, 13)
+        db.executeCommand("PRAGMA cache_size;")
+        self.assertNotEqual(db.cursor.fetchone()[0], -200000, "Pragmas not restored after batchAppend")
+
+    def test_setBatchAppendFailure(self):
+        fn = self.getOutputPath('test_batch_append_failure.sqlite')
+        imgSet = MockSetOfImages(filename=fn, indexes=['_index'])
+
+        db = imgSet._getMapper().db
+
+        with self.assertRaises(ValueError):
+            with imgSet.batchAppend(batchSize=3):
+                for i in range(5):
+                    imgSet.append(MockImage(location=(i + 1, IMAGES_STK)))
+                    # Creating the tables should not end the transaction
+                    self.assertTrue(db.connection.in_transaction)
+                raise ValueError("Something went wrong")
+
+        # None of the rows are kept, even the ones already flushed
+        self.assertEqual(0, imgSet._getMapper().count())
+
+        # Indexes of the new set should still be there
+        db.executeCommand("SELECT name FROM sqlite_master WHERE type='index'")
+        self.assertIn('index__index', [row[0] for row in db.cursor.fetchall()])
+        imgSet.close()
+
     def test_copyAttributes(self):
         """ Check that after copyAttributes, the values
         were properly copied.
@@ -24,6 +24,7 @@
 # **************************************************************************
 
 from pyworkflow.project.project import Project
+from pyworkflow.project.config import NodeConfigList
 from unittest import TestCase
 from unittest.mock import patch
 
@@ -40,3 +41,37 @@ class TestProject(TestCase):
             getruns.return_value = []
             proj = Project("domain", "path")
             proj.fixLinks("foo")
+
+
+class TestNodeConfigList(TestCase):
+
+    def test_removeNodes(self):
+        """ Test nodes are removed both from the list and the dictionary."""
+        nodes = NodeConfigList()
+        for nodeId in range(5):
+            nodes.addNode(nodeId, x=nodeId, y=2 * nodeId)
+
+        nodes.removeNodes([1, 3])
+        nodes.removeNode(4)
+
+        self.assertEqual([0, 2], [node.getId() for node in nodes])
+        self.assertIsNone(nodes.getNode(1))
+        self.assertEqual((2, 4), nodes.getNode(2).getPosition())
+
+        nodes.updateDict()
+        self.assertEqual([0, 2], sorted(nodes._nodesDict))
+
+        # An unknown id does not remove any node
+        with self.assertRaises(KeyError):
+            nodes.removeNodes([0, 7])
+        self.assertEqual([0, 2], [node.getId() for node in nodes])
+        self.assertIsNotNone(nodes.getNode(0))
+
+    def test_nodeVisible(self):
+        """ Test visible strings are parsed as Boolean does."""
+        nodes = NodeConfigList()
+        for nodeId, visible in enumerate([True, False, 'false', '0', 'True']):
+            nodes.addNode(nodeId, visible=visible)
+
+        self.assertEqual([True, False, False, False, True],
+                         [node.isVisible() for node in nodes])
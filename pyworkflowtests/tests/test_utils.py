@@ -206,5 +206,48 @@ class TestPathTools(unittest.TestCase):
         self.assertEqual(70, strToDuration("1m 10s"), "String duration wrongly converted")
 
 
+class TestIniFile(unittest.TestCase):
+
+    CONTENT = """; A comment
+[localhost]
+PARALLEL_COMMAND = mpirun -np %_(JOB_NODES)d %_(COMMAND)s
+NAME = SLURM
+SUBMIT_TEMPLATE = #!/bin/bash
+    #SBATCH -J %_(JOB_NAME)s
+
+    ## A single hash
+    %_(JOB_COMMAND)s
+QUEUES = {
+    "myslurmqueue": [["JOB_MEMORY", "8192", "Memory (MB)", "Select amount of memory"]]
+    }
+
+[Other host]
+ADDRESS: otherhost
+"""
+
+    def test_readIniFile(self):
+        from configparser import RawConfigParser
+        import tempfile
+
+        with tempfile.NamedTemporaryFile('w', suffix='.conf') as tmpFile:
+            tmpFile.write(self.CONTENT)
+            tmpFile.flush()
+
+            cp = RawConfigParser(comment_prefixes=";")
+            cp.optionxform = str
+            cp.read(tmpFile.name)
+
+            sections = pwutils.readIniFile(tmpFile.name, commentPrefixes=(';',))
+
+            self.assertEqual(cp.sections(), list(sections.keys()))
+            for section in cp.sections():
+                self.assertEqual(dict(cp.items(section)), dict(sections[section]))
 
+            self.assertIs(sections, pwutils.readIniFile(tmpFile.name, commentPrefixes=(';',)),
+                          "Unchanged file should not be parsed again.")
 
+            upperSections = pwutils.readIniFile(tmpFile.name, commentPrefixes=(';',),
+                                                valueConverter=str.upper)
+            self.assertEqual('OTHERHOST', upperSections['Other host']['ADDRESS'])
+            self.assertEqual('otherhost', sections['Other host']['ADDRESS'],
+                             "Converted values should not be mixed with the plain ones.")